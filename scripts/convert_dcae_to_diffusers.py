@@ -1,25 +1,27 @@
 import argparse
-from typing import Any, Dict
+import re
+from typing import Dict
 
 import torch
 from huggingface_hub import hf_hub_download
-from safetensors.torch import load_file
+from safetensors import safe_open
 
 from diffusers import AutoencoderDC
 
 
-def remap_qkv_(key: str, state_dict: Dict[str, Any]):
-    qkv = state_dict.pop(key)
-    q, k, v = torch.chunk(qkv, 3, dim=0)
+def remap_qkv(key: str, tensor: torch.Tensor) -> Dict[str, torch.Tensor]:
+    q, k, v = torch.chunk(tensor, 3, dim=0)
     parent_module, _, _ = key.rpartition(".qkv.conv.weight")
-    state_dict[f"{parent_module}.to_q.weight"] = q.squeeze()
-    state_dict[f"{parent_module}.to_k.weight"] = k.squeeze()
-    state_dict[f"{parent_module}.to_v.weight"] = v.squeeze()
+    return {
+        f"{parent_module}.to_q.weight": q.squeeze(),
+        f"{parent_module}.to_k.weight": k.squeeze(),
+        f"{parent_module}.to_v.weight": v.squeeze(),
+    }
 
 
-def remap_proj_conv_(key: str, state_dict: Dict[str, Any]):
+def remap_proj_conv(key: str, tensor: torch.Tensor) -> Dict[str, torch.Tensor]:
     parent_module, _, _ = key.rpartition(".proj.conv.weight")
-    state_dict[f"{parent_module}.to_out.weight"] = state_dict.pop(key).squeeze()
+    return {f"{parent_module}.to_out.weight": tensor.squeeze()}
 
 
 AE_KEYS_RENAME_DICT = {
@@ -74,47 +76,55 @@ AE_F128C512_KEYS = {
 }
 
 AE_SPECIAL_KEYS_REMAP = {
-    "qkv.conv.weight": remap_qkv_,
-    "proj.conv.weight": remap_proj_conv_,
+    "qkv.conv.weight": remap_qkv,
+    "proj.conv.weight": remap_proj_conv,
 }
 
 
-def get_state_dict(saved_dict: Dict[str, Any]) -> Dict[str, Any]:
-    state_dict = saved_dict
-    if "model" in saved_dict.keys():
-        state_dict = state_dict["model"]
-    if "module" in saved_dict.keys():
-        state_dict = state_dict["module"]
-    if "state_dict" in saved_dict.keys():
-        state_dict = state_dict["state_dict"]
-    return state_dict
-
-
-def update_state_dict_(state_dict: Dict[str, Any], old_key: str, new_key: str) -> Dict[str, Any]:
-    state_dict[new_key] = state_dict.pop(old_key)
-
-
 def convert_ae(config_name: str, dtype: torch.dtype):
     config = get_ae_config(config_name)
     hub_id = f"mit-han-lab/{config_name}"
     ckpt_path = hf_hub_download(hub_id, "model.safetensors")
-    original_state_dict = get_state_dict(load_file(ckpt_path))
 
     ae = AutoencoderDC(**config).to(dtype=dtype)
+    target_state_dict = ae.state_dict()
+    missing_keys = set(target_state_dict.keys())
+
+    # All rename patterns are plain substrings, so they can be applied in one pass over each key
+    # with a single compiled alternation instead of one str.replace per pattern. Longer patterns
+    # are tried first so that more specific renames win over their substrings (e.g.
+    # "encoder.project_out.0.conv" over "conv.conv."). This has to be compiled after
+    # get_ae_config, which updates AE_KEYS_RENAME_DICT for some checkpoints.
+    rename_pattern = re.compile(
+        "|".join(re.escape(replace_key) for replace_key in sorted(AE_KEYS_RENAME_DICT, key=len, reverse=True))
+    )
+
+    # Stream the checkpoint tensor-by-tensor instead of materializing the full state dict and a
+    # renamed copy of it in memory. Peak memory then stays at roughly one tensor instead of 2-3x
+    # the checkpoint size, which matters for the larger DC-AE checkpoints.
+    with safe_open(ckpt_path, framework="pt") as f:
+        # Resolve every rename up front in a single comprehension; this is pure string work, so it
+        # touches no tensor data and builds the key mapping in one pass.
+        name_map = {
+            key: rename_pattern.sub(lambda match: AE_KEYS_RENAME_DICT[match.group(0)], key) for key in f.keys()
+        }
+
+        for key, new_key in name_map.items():
+            tensors = {new_key: f.get_tensor(key)}
+            for special_key, handler_fn in AE_SPECIAL_KEYS_REMAP.items():
+                if special_key not in new_key:
+                    continue
+                tensors = handler_fn(new_key, tensors.pop(new_key))
 
-    for key in list(original_state_dict.keys()):
-        new_key = key[:]
-        for replace_key, rename_key in AE_KEYS_RENAME_DICT.items():
-            new_key = new_key.replace(replace_key, rename_key)
-        update_state_dict_(original_state_dict, key, new_key)
+            for target_key, tensor in tensors.items():
+                if target_key not in target_state_dict:
+                    raise ValueError(f"Original key {key} was remapped to {target_key}, which is not in the model.")
+                target_state_dict[target_key].copy_(tensor)
+                missing_keys.discard(target_key)
 
-    for key in list(original_state_dict.keys()):
-        for special_key, handler_fn_inplace in AE_SPECIAL_KEYS_REMAP.items():
-            if special_key not in key:
-                continue
-            handler_fn_inplace(key, original_state_dict)
+    if len(missing_keys) > 0:
+        raise ValueError(f"The following keys were not found in the original state dict: {missing_keys}")
 
-    ae.load_state_dict(original_state_dict, strict=True)
     return ae
 
 
@@ -448,7 +448,7 @@ class BasicTransformerBlock(nn.Module):
 
         # 5. Scale-shift for PixArt-Alpha.
         if norm_type == "ada_norm_single":
-            self.scale_shift_table = nn.Parameter(torch.randn(6, dim) / dim**0.5)
+            self.scale_shift_table = nn.Parameter(torch.empty(6, dim).normal_(std=dim**-0.5))
 
         # let chunk size default to None
         self._chunk_size = None
@@ -493,7 +493,8 @@ class BasicTransformerBlock(nn.Module):
                 self.scale_shift_table[None] + timestep.reshape(batch_size, 6, -1)
             ).chunk(6, dim=1)
             norm_hidden_states = self.norm1(hidden_states)
-            norm_hidden_states = norm_hidden_states * (1 + scale_msa) + shift_msa
+            # fused multiply-add so the modulation runs in one kernel instead of three
+            norm_hidden_states = torch.addcmul(shift_msa, norm_hidden_states, 1 + scale_msa)
         else:
             raise ValueError("Incorrect norm used")
 
@@ -513,10 +514,11 @@ class BasicTransformerBlock(nn.Module):
 
         if self.norm_type == "ada_norm_zero":
             attn_output = gate_msa.unsqueeze(1) * attn_output
+            hidden_states = attn_output + hidden_states
         elif self.norm_type == "ada_norm_single":
-            attn_output = gate_msa * attn_output
-
-        hidden_states = attn_output + hidden_states
+            hidden_states = torch.addcmul(hidden_states, gate_msa, attn_output)
+        else:
+            hidden_states = attn_output + hidden_states
         if hidden_states.ndim == 4:
             hidden_states = hidden_states.squeeze(1)
 
@@ -562,7 +564,7 @@ class BasicTransformerBlock(nn.Module):
 
         if self.norm_type == "ada_norm_single":
             norm_hidden_states = self.norm2(hidden_states)
-            norm_hidden_states = norm_hidden_states * (1 + scale_mlp) + shift_mlp
+            norm_hidden_states = torch.addcmul(shift_mlp, norm_hidden_states, 1 + scale_mlp)
 
         if self._chunk_size is not None:
             # "feed_forward_chunk_size" can be used to save memory
@@ -572,10 +574,11 @@ class BasicTransformerBlock(nn.Module):
 
         if self.norm_type == "ada_norm_zero":
             ff_output = gate_mlp.unsqueeze(1) * ff_output
+            hidden_states = ff_output + hidden_states
         elif self.norm_type == "ada_norm_single":
-            ff_output = gate_mlp * ff_output
-
-        hidden_states = ff_output + hidden_states
+            hidden_states = torch.addcmul(hidden_states, gate_mlp, ff_output)
+        else:
+            hidden_states = ff_output + hidden_states
         if hidden_states.ndim == 4:
             hidden_states = hidden_states.squeeze(1)
 
@@ -687,18 +687,24 @@ class Attention(nn.Module):
 
         current_length: int = attention_mask.shape[-1]
         if current_length != target_length:
+            # a boolean mask keeps positions where it is `True`, matching the `0.0` entries of an
+            # additive bias, so pad with the "keep" value of whichever format was passed. Keeping
+            # boolean masks boolean lets `F.scaled_dot_product_attention` pick its fused backends.
+            pad_value = True if attention_mask.dtype == torch.bool else 0.0
             if attention_mask.device.type == "mps":
                 # HACK: MPS: Does not support padding by greater than dimension of input tensor.
                 # Instead, we can manually construct the padding tensor.
                 padding_shape = (attention_mask.shape[0], attention_mask.shape[1], target_length)
-                padding = torch.zeros(padding_shape, dtype=attention_mask.dtype, device=attention_mask.device)
+                padding = torch.full(
+                    padding_shape, pad_value, dtype=attention_mask.dtype, device=attention_mask.device
+                )
                 attention_mask = torch.cat([attention_mask, padding], dim=2)
             else:
                 # TODO: for pipelines such as stable-diffusion, padding cross-attn mask:
                 #       we want to instead pad by (0, remaining_length), where remaining_length is:
                 #       remaining_length: int = target_length - current_length
                 # TODO: re-enable tests/models/test_models_unet_2d_condition.py#test_model_xattn_padding
-                attention_mask = F.pad(attention_mask, (0, target_length), value=0.0)
+                attention_mask = F.pad(attention_mask, (0, target_length), value=pad_value)
 
         if out_dim == 3:
             if attention_mask.shape[0] < batch_size * head_size:
@@ -861,12 +867,14 @@ class SanaMultiscaleLinearAttention(nn.Module):
         self.processor = SanaMultiscaleAttnProcessor2_0()
 
     def apply_linear_attention(self, query: torch.Tensor, key: torch.Tensor, value: torch.Tensor) -> torch.Tensor:
-        value = F.pad(value, (0, 0, 0, 1), mode="constant", value=1)  # Adds padding
         scores = torch.matmul(value, key.transpose(-1, -2))
-        hidden_states = torch.matmul(scores, query)
+        hidden_states = torch.matmul(scores, query).to(dtype=torch.float32)
 
-        hidden_states = hidden_states.to(dtype=torch.float32)
-        hidden_states = hidden_states[:, :, :-1] / (hidden_states[:, :, -1:] + self.eps)
+        # The normalizer is what a row of ones appended to `value` would contribute, so summing
+        # `key` over its token dimension gives the same result without padding (and thereby
+        # copying) the full `value` tensor.
+        normalizer = torch.matmul(key.sum(dim=-1, keepdim=True).transpose(-1, -2), query)
+        hidden_states = hidden_states / (normalizer.to(dtype=torch.float32) + self.eps)
         return hidden_states
 
     def apply_quadratic_attention(self, query: torch.Tensor, key: torch.Tensor, value: torch.Tensor) -> torch.Tensor:
@@ -171,7 +171,7 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
 
         # 3. Output blocks.
         self.norm_out = nn.LayerNorm(self.inner_dim, elementwise_affine=False, eps=1e-6)
-        self.scale_shift_table = nn.Parameter(torch.randn(2, self.inner_dim) / self.inner_dim**0.5)
+        self.scale_shift_table = nn.Parameter(torch.empty(2, self.inner_dim).normal_(std=self.inner_dim**-0.5))
         self.proj_out = nn.Linear(self.inner_dim, self.config.patch_size * self.config.patch_size * self.out_channels)
 
         self.adaln_single = AdaLayerNormSingle(
@@ -295,6 +295,31 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
         if self.original_attn_processors is not None:
             self.set_attn_processor(self.original_attn_processors)
 
+    @classmethod
+    def prepare_attention_masks(
+        cls,
+        attention_mask: Optional[torch.Tensor],
+        encoder_attention_mask: Optional[torch.Tensor],
+        dtype: torch.dtype,
+    ):
+        r"""
+        Convert 2D keep/discard masks (`1` = keep, `0` = discard) into the additive bias format consumed by
+        [`~PixArtTransformer2DModel.forward`] (`0` = keep, `-10000.0` = discard), with a singleton query-tokens
+        dimension. Masks that are already biases (`ndim != 2`) are returned unchanged.
+
+        The conversion does not depend on the denoising step, so pipelines can call this once before their denoising
+        loop and reuse the converted masks for every step instead of reconverting them inside `forward` each time.
+        """
+        if attention_mask is not None and attention_mask.ndim == 2:
+            attention_mask = (1 - attention_mask.to(dtype)) * -10000.0
+            attention_mask = attention_mask.unsqueeze(1)
+
+        if encoder_attention_mask is not None and encoder_attention_mask.ndim == 2:
+            encoder_attention_mask = (1 - encoder_attention_mask.to(dtype)) * -10000.0
+            encoder_attention_mask = encoder_attention_mask.unsqueeze(1)
+
+        return attention_mask, encoder_attention_mask
+
     def forward(
         self,
         hidden_states: torch.Tensor,
@@ -346,8 +371,10 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
             raise ValueError("`added_cond_kwargs` cannot be None when using additional conditions for `adaln_single`.")
 
         # ensure attention_mask is a bias, and give it a singleton query_tokens dimension.
-        #   we may have done this conversion already, e.g. if we came here via UNet2DConditionModel#forward.
-        #   we can tell by counting dims; if ndim == 2: it's a mask rather than a bias.
+        #   we may have done this conversion already, e.g. if the pipeline called
+        #   `prepare_attention_masks` before its denoising loop, or if we came here via
+        #   UNet2DConditionModel#forward. we can tell by counting dims; if ndim == 2: it's a mask
+        #   rather than a bias.
         # expects mask of shape:
         #   [batch, key_tokens]
         # adds singleton query_tokens dimension:
@@ -355,49 +382,43 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
         # this helps to broadcast it as a bias over attention scores, which will be in one of the following shapes:
         #   [batch,  heads, query_tokens, key_tokens] (e.g. torch sdp attn)
         #   [batch * heads, query_tokens, key_tokens] (e.g. xformers or classic attn)
-        if attention_mask is not None and attention_mask.ndim == 2:
-            # assume that mask is expressed as:
-            #   (1 = keep,      0 = discard)
-            # convert mask into a bias that can be added to attention scores:
-            #       (keep = +0,     discard = -10000.0)
-            attention_mask = (1 - attention_mask.to(hidden_states.dtype)) * -10000.0
-            attention_mask = attention_mask.unsqueeze(1)
-
-        # convert encoder_attention_mask to a bias the same way we do for attention_mask
-        if encoder_attention_mask is not None and encoder_attention_mask.ndim == 2:
-            encoder_attention_mask = (1 - encoder_attention_mask.to(hidden_states.dtype)) * -10000.0
-            encoder_attention_mask = encoder_attention_mask.unsqueeze(1)
+        attention_mask, encoder_attention_mask = self.prepare_attention_masks(
+            attention_mask, encoder_attention_mask, hidden_states.dtype
+        )
 
         # 1. Input
         batch_size = hidden_states.shape[0]
+        # hoisted into a local because config attribute access goes through FrozenDict dispatch
+        patch_size = self.config.patch_size
         height, width = (
-            hidden_states.shape[-2] // self.config.patch_size,
-            hidden_states.shape[-1] // self.config.patch_size,
+            hidden_states.shape[-2] // patch_size,
+            hidden_states.shape[-1] // patch_size,
         )
         hidden_states = self.pos_embed(hidden_states)
 
         timestep, embedded_timestep = self.adaln_single(
             timestep, added_cond_kwargs, batch_size=batch_size, hidden_dtype=hidden_states.dtype
         )
+        # reshape once here instead of inside every block; the per-block reshape is then a no-op
+        timestep = timestep.reshape(batch_size, 6, -1)
 
         if self.caption_projection is not None:
             encoder_hidden_states = self.caption_projection(encoder_hidden_states)
-            encoder_hidden_states = encoder_hidden_states.view(batch_size, -1, hidden_states.shape[-1])
 
         # 2. Blocks
-        for block in self.transformer_blocks:
-            if torch.is_grad_enabled() and self.gradient_checkpointing:
+        if torch.is_grad_enabled() and self.gradient_checkpointing:
 
-                def create_custom_forward(module, return_dict=None):
-                    def custom_forward(*inputs):
-                        if return_dict is not None:
-                            return module(*inputs, return_dict=return_dict)
-                        else:
-                            return module(*inputs)
+            def create_custom_forward(module, return_dict=None):
+                def custom_forward(*inputs):
+                    if return_dict is not None:
+                        return module(*inputs, return_dict=return_dict)
+                    else:
+                        return module(*inputs)
 
-                    return custom_forward
+                return custom_forward
 
-                ckpt_kwargs: Dict[str, Any] = {"use_reentrant": False} if is_torch_version(">=", "1.11.0") else {}
+            ckpt_kwargs: Dict[str, Any] = {"use_reentrant": False} if is_torch_version(">=", "1.11.0") else {}
+            for block in self.transformer_blocks:
                 hidden_states = torch.utils.checkpoint.checkpoint(
                     create_custom_forward(block),
                     hidden_states,
@@ -409,7 +430,8 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
                     None,
                     **ckpt_kwargs,
                 )
-            else:
+        else:
+            for block in self.transformer_blocks:
                 hidden_states = block(
                     hidden_states,
                     attention_mask=attention_mask,
@@ -425,19 +447,17 @@ class PixArtTransformer2DModel(ModelMixin, ConfigMixin):
             self.scale_shift_table[None] + embedded_timestep[:, None].to(self.scale_shift_table.device)
         ).chunk(2, dim=1)
         hidden_states = self.norm_out(hidden_states)
-        # Modulation
-        hidden_states = hidden_states * (1 + scale.to(hidden_states.device)) + shift.to(hidden_states.device)
+        # Modulation, fused into a single multiply-add kernel
+        hidden_states = torch.addcmul(
+            shift.to(hidden_states.device), hidden_states, 1 + scale.to(hidden_states.device)
+        )
         hidden_states = self.proj_out(hidden_states)
         hidden_states = hidden_states.squeeze(1)
 
         # unpatchify
-        hidden_states = hidden_states.reshape(
-            shape=(-1, height, width, self.config.patch_size, self.config.patch_size, self.out_channels)
-        )
+        hidden_states = hidden_states.reshape(shape=(-1, height, width, patch_size, patch_size, self.out_channels))
         hidden_states = torch.einsum("nhwpqc->nchpwq", hidden_states)
-        output = hidden_states.reshape(
-            shape=(-1, self.out_channels, height * self.config.patch_size, width * self.config.patch_size)
-        )
+        output = hidden_states.reshape(shape=(-1, self.out_channels, height * patch_size, width * patch_size))
 
         if not return_dict:
             return (output,)
@@ -885,6 +885,12 @@ class PixArtAlphaPipeline(DiffusionPipeline):
 
             added_cond_kwargs = {"resolution": resolution, "aspect_ratio": aspect_ratio}
 
+        # 6.2 Convert the prompt attention mask to the transformer's additive bias format once, instead of
+        # reconverting it inside the transformer on every denoising step.
+        _, prompt_attention_mask = self.transformer.prepare_attention_masks(
+            None, prompt_attention_mask, prompt_embeds.dtype
+        )
+
         # 7. Denoising loop
         num_warmup_steps = max(len(timesteps) - num_inference_steps * self.scheduler.order, 0)
 
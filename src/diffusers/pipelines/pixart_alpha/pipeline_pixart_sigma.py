@@ -800,6 +800,12 @@ class PixArtSigmaPipeline(DiffusionPipeline):
         # 6.1 Prepare micro-conditions.
         added_cond_kwargs = {"resolution": None, "aspect_ratio": None}
 
+        # 6.2 Convert the prompt attention mask to the transformer's additive bias format once, instead of
+        # reconverting it inside the transformer on every denoising step.
+        _, prompt_attention_mask = self.transformer.prepare_attention_masks(
+            None, prompt_attention_mask, prompt_embeds.dtype
+        )
+
         # 7. Denoising loop
         num_warmup_steps = max(len(timesteps) - num_inference_steps * self.scheduler.order, 0)
 